@@ -106,6 +106,9 @@ class ImpactIndicator:
     __slots__ = ('_ID', '_alias', '_method', '_category', '_unit', '_ureg_unit',
                  '_unit_remaining', '_description')
 
+    # alias -> indicator, entries are validated upon lookup (see `_get_by_alias`)
+    _aliases = {}
+
     def __init__(self, ID='', alias='', method='', category='', unit='', description='',
                  **kwargs):
         # Check consistency in attr values.
@@ -259,8 +262,7 @@ class ImpactIndicator:
     @classmethod
     def get_indicator(cls, ID_or_alias):
         '''Get an impact indicator by its ID or alias.'''
-        dct = cls.get_all_indicators(True)
-        return dct.get(ID_or_alias)
+        return cls._get_by_alias(ID_or_alias) or cls.registry.data.get(ID_or_alias)
 
     @classmethod
     def load_indicators_from_file(cls, path_or_dict, index_col=None):
@@ -304,24 +306,27 @@ class ImpactIndicator:
 
         data = load_data(path=path_or_df, index_col=index_col) if isinstance(path_or_df, str) else path_or_df
 
-        for num in data.index:
+        # Missing columns are left to the defaults ('') of `__init__`
+        cols = ['indicator'] + [k for k in ('alias', 'unit', 'method', 'category', 'description')
+                                if k in data.columns]
+        for row in data[cols].itertuples(index=False, name=None):
+            kwargs = dict(zip(cols, row))
             new = cls.__new__(cls)
-            kwargs = {}
-            for k in ('alias', 'unit', 'method', 'category', 'description'):
-                try:
-                    kwargs[k] = data.iloc[num][k]
-                except KeyError:
-                    kwargs[k] = ''
+            new.__init__(ID=kwargs.pop('indicator'), **kwargs)
 
-            new.__init__(ID=data.iloc[num]['indicator'], **kwargs)
+    @classmethod
+    def _get_by_alias(cls, alias):
+        ind = cls._aliases.get(alias)
+        # Stale entries (alias changed or indicator deregistered) are ignored
+        if ind is not None and ind._alias == alias \
+            and cls.registry.data.get(ind.ID) is ind:
+            return ind
 
     @classmethod
     def _get_alias_dct(cls):
-        dct = {}
-        for i in cls.registry.data.values():
-            if i.alias:
-                dct[i.alias] = i
-        return dct
+        get = cls._get_by_alias
+        return {alias: ind for alias in tuple(cls._aliases)
+                if (ind := get(alias)) is not None}
 
     @property
     def ID(self):
@@ -340,18 +345,19 @@ class ImpactIndicator:
     @alias.setter
     def alias(self, alias):
         alias = None if str(alias) == 'nan' else alias
-        alias_dct = self._get_alias_dct()
 
         if alias:
             if not isinstance(alias, str):
                 raise TypeError(f'`alias` can only be a str, not {type(alias).__name__}.')
 
-            if alias in alias_dct.keys():
-                old_ind = alias_dct[alias]
-                if old_ind.ID != self.ID:
-                    warn(f'The alias "{alias}" is now being used for "{self.ID}", ' \
-                         f'instead of {old_ind.ID}.')
-                    old_ind._alias = None
+            old_ind = self._get_by_alias(alias)
+            if old_ind is None:
+                ImpactIndicator._aliases[alias] = self
+            elif old_ind.ID != self.ID:
+                warn(f'The alias "{alias}" is now being used for "{self.ID}", ' \
+                     f'instead of {old_ind.ID}.')
+                old_ind._alias = None
+                ImpactIndicator._aliases[alias] = self
             self._alias = alias
 
         else:
@@ -14,12 +14,15 @@ for license details.
 '''
 
 
-from math import ceil, pi
+from math import ceil, pi, sqrt
 import numpy as np
+from numba import njit
+from scipy.sparse import csr_matrix
 from . import Decay
 from .. import SanUnit, Construction, WasteStream
 from ..sanunits import HXutility, WWTpump, CSTR
-from ..utils import ospath, load_data, data_path, auom, calculate_excavation_volume
+from ..utils import ospath, data_path, auom, calculate_excavation_volume
+from ..utils.loading import _load_default_params
 __all__ = (
     'AnaerobicBaffledReactor',
     'AnaerobicCSTR',
@@ -27,6 +30,14 @@ __all__ = (
     'SludgeDigester',
     )
 
+_bar_to_Pa = auom('bar').conversion_factor('Pa')
+_Pa_to_bar = auom('Pa').conversion_factor('bar')
+_ft_to_m = auom('ft').conversion_factor('m')
+_ft2_to_m2 = auom('ft2').conversion_factor('m2')
+_mg_L_to_kg_m3 = 1e-3
+_kg_m3_to_mg_L = 1e3
+_N_to_N2O = 44/28 # N to N2O mass
+
 
 # %%
 
@@ -87,11 +98,8 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
             Construction('excavation', linked_unit=self, item='Excavation', quantity_unit='m3'),
             )
 
-        data = load_data(path=abr_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, '_'+para, value)
-        del data
+        for attr, value in _load_default_params(abr_path, '_'):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -106,28 +114,26 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
         biogas.phase = CH4.phase = N2O.phase = 'g'
 
         # COD removal
+        COD_removal = self.COD_removal
         _COD = waste._COD or waste.COD
-        COD_deg = _COD*waste.F_vol/1e3*self.COD_removal # kg/hr
-        treated._COD *= (1-self.COD_removal)
-        treated.imass[self.degraded_components] *= (1-self.COD_removal)
-
-        CH4_prcd = COD_deg*self.MCF_decay*self.max_CH4_emission
-        if self.if_capture_biogas:
-            biogas.imass['CH4'] = CH4_prcd
-            CH4.empty()
-        else:
-            CH4.imass['CH4'] = CH4_prcd
-            biogas.empty()
+        COD_deg = _COD*waste.F_vol*_mg_L_to_kg_m3*COD_removal # kg/hr
+        treated._COD *= (1-COD_removal)
+        treated.imass[self.degraded_components] *= (1-COD_removal)
 
-        N_tot = waste.TN/1e3 * waste.F_vol
+        CH4_out, unused = (biogas, CH4) if self.if_capture_biogas else (CH4, biogas)
+        CH4_out.imass['CH4'] = COD_deg*self.MCF_decay*self.max_CH4_emission
+        unused.empty()
+
+        N_tot = waste.TN*_mg_L_to_kg_m3 * waste.F_vol
         N_loss_tot = N_tot * self.N_removal
-        NH3_rmd, NonNH3_rmd = \
-            self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-        treated.imass ['NH3'] = waste.imass['NH3'] - NH3_rmd
-        treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
+        NH3_in, NonNH3_in = waste.imass['NH3'], waste.imass['NonNH3']
+        NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+        treated_imass = treated.imass
+        treated_imass['NH3'] = NH3_in - NH3_rmd
+        treated_imass['NonNH3'] = NonNH3_in - NonNH3_rmd
 
         if self.if_N2O_emission:
-            N2O.imass['N2O'] = N_loss_tot*self.N_max_decay*self.N2O_EF_decay*44/28
+            N2O.imass['N2O'] = N_loss_tot*self.N_max_decay*self.N2O_EF_decay*_N_to_N2O
         else:
             N2O.empty()
 
@@ -244,6 +250,37 @@ class AnaerobicBaffledReactor(SanUnit, Decay):
 
 # %%
 
+@njit(cache=True)
+def _production_rates_dense(M_stoichio, rhos, rxn):
+    n_rxn, n_cmps = M_stoichio.shape
+    for j in range(n_cmps):
+        r = 0.
+        for i in range(n_rxn):
+            r += M_stoichio[i,j] * rhos[i]
+        rxn[j] = r
+
+@njit(cache=True)
+def _production_rates_csr(indptr, indices, data, rhos, rxn):
+    # `indptr`, `indices`, and `data` define the transposed stoichiometry in CSR format
+    for j in range(rxn.shape[0]):
+        r = 0.
+        for k in range(indptr[j], indptr[j+1]):
+            r += data[k] * rhos[indices[k]]
+        rxn[j] = r
+
+@njit(cache=True)
+def _dydt_anaerobic_cstr(QC_ins, dQC_ins, QC, rxn, rhos_gas, f_out,
+                        V_liq, V_gas, q_gas, gas_transfer2conc, n_cmps, n_gas, _dstate):
+    Q = QC[-1]
+    Q_in = QC_ins[0,-1]
+    for j in range(n_cmps):
+        S_in = QC_ins[0,j] * _mg_L_to_kg_m3
+        _dstate[j] = (Q_in*S_in - Q*QC[j]*f_out[j])/V_liq + rxn[j]
+    for k in range(n_gas):
+        _dstate[n_cmps+k] = - q_gas*QC[n_cmps+k]/V_gas \
+            + rhos_gas[k] * gas_transfer2conc[k]
+    _dstate[-1] = dQC_ins[0,-1]
+
 class AnaerobicCSTR(CSTR):
     
     '''
@@ -292,6 +329,7 @@ class AnaerobicCSTR(CSTR):
     _ins_size_is_fixed = True
     _outs_size_is_fixed = True
     _R = 8.3145e-2 # Universal gas constant, [bar/M/K]
+    _cached_cmps = None
     
     def __init__(self, ID='', ins=None, outs=(), thermo=None,
                  init_with='WasteStream', V_liq=3400, V_gas=300, model=None,  
@@ -318,8 +356,9 @@ class AnaerobicCSTR(CSTR):
         self.external_P = external_P
         self.pipe_resistance = pipe_resistance
         self.fixed_headspace_P = fixed_headspace_P
-        self._f_retain = np.array([fraction_retain if cmp.ID in retain_cmps \
-                                   else 0 for cmp in self.components])
+        retained = np.isin(self.components.IDs, tuple(retain_cmps))
+        self._f_retain = np.where(retained, fraction_retain, 0.)
+        self._liq_scale = (1-self._f_retain)*_kg_m3_to_mg_L
     
     def ideal_gas_law(self, p=None, S=None):
         '''Calculates partial pressure [bar] given concentration [M] at 
@@ -330,10 +369,17 @@ class AnaerobicCSTR(CSTR):
 
     def p_vapor(self, convert_to_bar=True):
         '''Calculates the saturated vapor pressure at operation temperature.'''
-        p = self.components.H2O.Psat(self.T)
-        if convert_to_bar:
-            return p*auom('Pa').conversion_factor('bar')
-        else: return p
+        if convert_to_bar: return self._p_vapor_bar
+        else: return self.components.H2O.Psat(self.T)
+
+    @property
+    def T(self):
+        '''[float] Operation temperature [K].'''
+        return self._T
+    @T.setter
+    def T(self, T):
+        self._T = T
+        self._p_vapor_bar = self.components.H2O.Psat(T) * _Pa_to_bar
         
     @property
     def DO_ID(self):
@@ -364,14 +410,29 @@ class AnaerobicCSTR(CSTR):
     def model(self, model):
         '''[:class:`CompiledProcesses` or NoneType] Anaerobic digestion model.'''
         CSTR.suspended_growth_model.fset(self, model)
+        cmps = self.components
+        if self._cached_cmps is not cmps:
+            self._cached_cmps = cmps
+            self._cmp_IDs = list(cmps.IDs)
+            self._gas_cmp_indices = {}
+            self._i_mass = np.asarray(cmps.i_mass)
+            self._chem_MW = np.asarray(cmps.chem_MW)
+            self._n_cmps = len(cmps)
+            self._H2O_idx = cmps.index('H2O')
+            self._gas_mol2mass = self._chem_MW/self._i_mass*_kg_m3_to_mg_L # M biogas to mg (measured_unit)/L
         if model is not None:
             #!!! how to make unit conversion generalizable to all models?
             self._S_vapor = self.ideal_gas_law(p=self.p_vapor())
-            self._n_gas = len(model._biogas_IDs)
-            self._state_keys = list(self.components.IDs) \
-                + [ID+'_gas' for ID in self.model._biogas_IDs] \
+            biogas_IDs = tuple(model._biogas_IDs)
+            self._n_gas = len(biogas_IDs)
+            self._state_keys = self._cmp_IDs \
+                + [ID+'_gas' for ID in biogas_IDs] \
                 + ['Q']
-            self._gas_cmp_idx = self.components.indices(self.model._biogas_IDs)
+            gas_cmp_indices = self._gas_cmp_indices
+            if biogas_IDs not in gas_cmp_indices:
+                gas_cmp_indices[biogas_IDs] = cmps.indices(biogas_IDs)
+            self._gas_cmp_idx = gas_cmp_indices[biogas_IDs]
+            self._gas_mass2mol = (self._i_mass/self._chem_MW)[self._gas_cmp_idx]
             self._state_header = self._state_keys
     
     @property
@@ -438,64 +499,62 @@ class AnaerobicCSTR(CSTR):
         liquid.copy_like(inf)
         gas.copy_like(self._biogas)
         if self._fixed_P_gas: 
-            gas.P = self.headspace_P * auom('bar').conversion_factor('Pa')
+            gas.P = self.headspace_P * _bar_to_Pa
         gas.T = self.T
         
     def _init_state(self):
         inf, = self._ins
         Q = inf.get_total_flow('m3/d')
         #!!! how to make unit conversion generalizable to all models?
-        if self._concs is not None: Cs = self._concs * 1e-3 # mg/L to kg/m3
-        else: Cs = inf.conc * 1e-3 # mg/L to kg/m3
-        self._state = np.append(Cs, [0]*self._n_gas + [Q]).astype('float64')
-        self._dstate = self._state * 0.
+        if self._concs is not None: Cs = self._concs * _mg_L_to_kg_m3
+        else: Cs = inf.conc * _mg_L_to_kg_m3
+        n_cmps = len(Cs)
+        state = np.empty(n_cmps+self._n_gas+1, dtype='float64')
+        state[:n_cmps] = Cs
+        state[n_cmps:-1] = 0.
+        state[-1] = Q
+        self._state = state
+        self._dstate = np.zeros_like(state)
 
     def _update_state(self):
         arr = self._state
         gas, liquid = self._outs
-        f_rtn = self._f_retain
-        y = arr.copy()
-        i_mass = self.components.i_mass
-        chem_MW = self.components.chem_MW
-        n_cmps = len(self.components)
+        n_cmps = self._n_cmps
         if liquid.state is None:
-            liquid.state = np.append(y[:n_cmps]*(1-f_rtn)*1e3, y[-1])
+            liquid.state = np.append(arr[:n_cmps]*self._liq_scale, arr[-1])
         else:
-            liquid.state[:n_cmps] = y[:n_cmps]*(1-f_rtn)*1e3  # kg/m3 to mg/L
-            liquid.state[-1] = y[-1]
+            np.multiply(arr[:n_cmps], self._liq_scale, out=liquid.state[:n_cmps]) # kg/m3 to mg/L
+            liquid.state[-1] = arr[-1]
         if gas.state is None:
             gas.state = np.zeros(n_cmps+1)
-        gas.state[self._gas_cmp_idx] = y[n_cmps:(n_cmps + self._n_gas)]
-        gas.state[self.components.index('H2O')] = self._S_vapor
-        gas.state[-1] = self._q_gas
-        gas.state[:n_cmps] = gas.state[:n_cmps] * chem_MW / i_mass * 1e3 # i.e., M biogas to mg (measured_unit) / L
+        gas_state = gas.state
+        gas_state[self._gas_cmp_idx] = arr[n_cmps:(n_cmps + self._n_gas)]
+        gas_state[self._H2O_idx] = self._S_vapor
+        gas_state[-1] = self._q_gas
+        np.multiply(gas_state[:n_cmps], self._gas_mol2mass, out=gas_state[:n_cmps]) # i.e., M biogas to mg (measured_unit) / L
 
     def _update_dstate(self):
         arr = self._dstate
         gas, liquid = self._outs
-        f_rtn = self._f_retain
-        dy = arr.copy()
-        n_cmps = len(self.components)
+        n_cmps = self._n_cmps
         if liquid.dstate is None:
-            liquid.dstate = np.append(dy[:n_cmps]*(1-f_rtn)*1e3, dy[-1])
+            liquid.dstate = np.append(arr[:n_cmps]*self._liq_scale, arr[-1])
         else:
-            liquid.dstate[:n_cmps] = dy[:n_cmps]*(1-f_rtn)*1e3
-            liquid.dstate[-1] = dy[-1]
+            np.multiply(arr[:n_cmps], self._liq_scale, out=liquid.dstate[:n_cmps])
+            liquid.dstate[-1] = arr[-1]
         if gas.dstate is None:
             # contains no info on dstate
             gas.dstate = np.zeros(n_cmps+1)
 
     
     def f_q_gas_fixed_P_headspace(self, rhoTs, S_gas, T):
-        cmps = self.components
-        gas_mass2mol_conversion = (cmps.i_mass / cmps.chem_MW)[self._gas_cmp_idx]
-        self._q_gas = self._R*T/(self.P_gas-self.p_vapor(convert_to_bar=True))\
-                                *self.V_liq*sum(rhoTs*gas_mass2mol_conversion)
+        self._q_gas = self._R*T/(self._P_gas-self._p_vapor_bar)\
+                                *self.V_liq*(rhoTs @ self._gas_mass2mol)
         return self._q_gas
 
     def f_q_gas_var_P_headspace(self, rhoTs, S_gas, T):
         p_gas = S_gas * self._R * T
-        self._P_gas = P = sum(p_gas) + self.p_vapor(convert_to_bar=True) 
+        self._P_gas = P = p_gas.sum() + self._p_vapor_bar
         self._q_gas = self._k_p * (P - self._P_atm)
         return self._q_gas
 
@@ -509,41 +568,53 @@ class AnaerobicCSTR(CSTR):
         if self._model is None:
             CSTR._compile_ODE(self)
         else:
-            cmps = self.components
-            f_rtn = self._f_retain
+            f_out = 1 - self._f_retain
             _dstate = self._dstate
             _update_dstate = self._update_dstate
             _f_rhos = self.model.rate_function
             _f_param = self.model.params_eval
             _M_stoichio = self.model.stoichio_eval
-            n_cmps = len(cmps)
+            n_cmps = self._n_cmps
             n_gas = self._n_gas
+            n_cmps_gas = n_cmps + n_gas
             V_liq = self.V_liq
             V_gas = self.V_gas
             T = self.T
-            gas_mass2mol_conversion = (cmps.i_mass / cmps.chem_MW)[self._gas_cmp_idx]
+            gas_transfer2conc = V_liq/V_gas * self._gas_mass2mol
+            gas_slice = slice(-n_gas, None)
             hasexo = bool(len(self._exovars))
             f_exovars = self.eval_exo_dynamic_vars
+            n_state = len(_dstate)
+            QC_ext = np.empty(n_state+len(self._exovars))
             if self._fixed_P_gas:
                 f_qgas = self.f_q_gas_fixed_P_headspace
             else:
                 f_qgas = self.f_q_gas_var_P_headspace
+            rxn = np.empty(n_cmps)
+            M_T_csr = None
+            if not self.model._dyn_params:
+                # Constant stoichiometry, only loop over the nonzero coefficients if sparse
+                M_T = _M_stoichio().T
+                if np.count_nonzero(M_T) < 0.3*M_T.size:
+                    M_T_csr = csr_matrix(M_T)
+                    indptr, indices, data = M_T_csr.indptr, M_T_csr.indices, M_T_csr.data
+            dydt = _dydt_anaerobic_cstr
             def dy_dt(t, QC_ins, QC, dQC_ins):
-                S_liq = QC[:n_cmps]
-                S_gas = QC[n_cmps: (n_cmps+n_gas)]
-                Q = QC[-1]
-                S_in = QC_ins[0,:-1] * 1e-3  # mg/L to kg/m3
-                Q_in = QC_ins[0,-1]
-                if hasexo: QC = np.append(QC, f_exovars(t))
-                _f_param(QC)
-                M_stoichio = _M_stoichio()
-                rhos =_f_rhos(QC)
-                _dstate[:n_cmps] = (Q_in*S_in - Q*S_liq*(1-f_rtn))/V_liq \
-                    + np.dot(M_stoichio.T, rhos)
-                q_gas = f_qgas(rhos[-3:], S_gas, T)
-                _dstate[n_cmps: (n_cmps+n_gas)] = - q_gas*S_gas/V_gas \
-                    + rhos[-3:] * V_liq/V_gas * gas_mass2mol_conversion
-                _dstate[-1] = dQC_ins[0,-1]
+                S_gas = QC[n_cmps:n_cmps_gas]
+                if hasexo:
+                    QC_ext[:n_state] = QC
+                    QC_ext[n_state:] = f_exovars(t)
+                    QC_exo = QC_ext
+                else: QC_exo = QC
+                _f_param(QC_exo)
+                rhos =_f_rhos(QC_exo)
+                if M_T_csr is None: _production_rates_dense(_M_stoichio(), rhos, rxn)
+                else: _production_rates_csr(indptr, indices, data, rhos, rxn)
+                rhos_gas = rhos[gas_slice]
+                q_gas = f_qgas(rhos_gas, S_gas, T)
+                dydt(QC_ins, dQC_ins, QC, rxn, rhos_gas,
+                     f_out, V_liq, V_gas, q_gas, gas_transfer2conc,
+                     n_cmps, n_gas, _dstate)
                 _update_dstate()
             self._ODE = dy_dt
 
@@ -610,11 +681,8 @@ class AnaerobicDigestion(SanUnit, Decay):
             Construction('excavation', linked_unit=self, item='Excavation', quantity_unit='m3'),
             )
 
-        data = load_data(path=ad_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, '_'+para, value)
-        del data
+        for attr, value in _load_default_params(ad_path, '_'):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -631,29 +699,27 @@ class AnaerobicDigestion(SanUnit, Decay):
         biogas.phase = CH4.phase = N2O.phase = 'g'
 
         # COD removal
+        COD_removal = self.COD_removal
         _COD = waste._COD or waste.COD
-        COD_deg = _COD*treated.F_vol/1e3*self.COD_removal # kg/hr
-        treated._COD *= (1-self.COD_removal)
-        treated.imass[self.degraded_components] *= (1-self.COD_removal)
-
-        CH4_prcd = COD_deg*self.MCF_decay*self.max_CH4_emission
-        if self.if_capture_biogas:
-            biogas.imass['CH4'] = CH4_prcd
-            CH4.empty()
-        else:
-            CH4.imass['CH4'] = CH4_prcd
-            biogas.empty()
+        COD_deg = _COD*treated.F_vol*_mg_L_to_kg_m3*COD_removal # kg/hr
+        treated._COD *= (1-COD_removal)
+        treated.imass[self.degraded_components] *= (1-COD_removal)
+
+        CH4_out, unused = (biogas, CH4) if self.if_capture_biogas else (CH4, biogas)
+        CH4_out.imass['CH4'] = COD_deg*self.MCF_decay*self.max_CH4_emission
+        unused.empty()
 
         if self.if_N2O_emission:
             N_loss = self.first_order_decay(k=self.decay_k_N,
                                             t=self.tau/365,
                                             max_decay=self.N_max_decay)
-            N_loss_tot = N_loss*waste.TN/1e3*waste.F_vol
-            NH3_rmd, NonNH3_rmd = \
-                self.allocate_N_removal(N_loss_tot, waste.imass['NH3'])
-            treated.imass['NH3'] = waste.imass['NH3'] - NH3_rmd
-            treated.imass['NonNH3'] = waste.imass['NonNH3'] - NonNH3_rmd
-            N2O.imass['N2O'] = N_loss_tot*self.N2O_EF_decay*44/28
+            N_loss_tot = N_loss*waste.TN*_mg_L_to_kg_m3*waste.F_vol
+            NH3_in, NonNH3_in = waste.imass['NH3'], waste.imass['NonNH3']
+            NH3_rmd, NonNH3_rmd = self.allocate_N_removal(N_loss_tot, NH3_in)
+            treated_imass = treated.imass
+            treated_imass['NH3'] = NH3_in - NH3_rmd
+            treated_imass['NonNH3'] = NonNH3_in - NonNH3_rmd
+            N2O.imass['N2O'] = N_loss_tot*self.N2O_EF_decay*_N_to_N2O
         else:
             N2O.empty()
 
@@ -872,31 +938,54 @@ class SludgeDigester(SanUnit):
             include_OM_cost=False)
 
 
+    _cached_cmps = None
+    def _get_groups(self):
+        # Resolved lazily as `active_biomass` may only be defined
+        # in the components used for simulation,
+        # compositions are used to distribute the group flow as in `imass`
+        cmps = self.components
+        if cmps is not self._cached_cmps:
+            wt_compositions = cmps._group_wt_compositions
+            self._groups = groups = tuple(
+                (np.asarray(cmps.index(group)), wt_compositions[group])
+                for group in ('active_biomass', 'substrates')
+                )
+            # Same as `WasteStream.COD` (excluding biomass) but in g/d per kg/hr
+            i_COD = cmps.i_COD
+            COD_coeff = i_COD * (cmps.s+cmps.c+cmps.x) * (i_COD>=0) * 1e3 * 24
+            COD_coeff[cmps.index('H2O')] = 0
+            COD_coeff[groups[0][0]] = 0
+            self._COD_coeff = COD_coeff
+            self._cached_cmps = cmps
+        return self._groups
+
     def _run(self):
         sludge, = self.ins
         digested, biogas = self.outs
         digested.T = biogas.T = self.T
         biogas.phase = 'g'
 
-        # Biogas production estimation based on Example 13-5 of Metcalf & Eddy, 5th edn.
-        Y, b, SRT = self.Y, self.b, self.SRT
-        organics_conversion, COD_factor = self.organics_conversion, self.COD_factor
-        methane_yield, methane_fraction = self.methane_yield, self.methane_fraction
-        biomass_COD = sludge.imass['active_biomass'].sum()*1e3*24*1.42 # [g/d], 1.42 converts VSS to COD
-
-        digested.mass = sludge.mass
-        digested.imass['active_biomass'] = 0 # biomass-derived COD calculated separately
-        substrate_COD = digested.COD*24*digested.F_vol # [g/d]
+        organics_conversion = self.organics_conversion
+        methane_fraction = self.methane_fraction
+        (biomass_idx, biomass_wt), (substrate_idx, substrate_wt) = self._get_groups()
+        sludge_mass = sludge.mass.value
+        biomass = sludge_mass[biomass_idx].sum()
+        # Biomass-derived COD calculated separately
+        substrate_COD = sludge_mass @ self._COD_coeff # [g/d]
 
+        # Biogas production estimation based on Example 13-5 of Metcalf & Eddy, 5th edn.
+        biomass_COD = biomass*1e3*24*1.42 # [g/d], 1.42 converts VSS to COD
         tot_COD = biomass_COD + substrate_COD # [g/d]
-
-        digestion_yield = Y*tot_COD*organics_conversion/(1+b*SRT) # [g/d]
-        methane_vol = methane_yield*tot_COD*organics_conversion - COD_factor*digestion_yield
+        digestion_yield = self.Y*tot_COD*organics_conversion/(1+self.b*self.SRT) # [g/d]
+        methane_vol = self.methane_yield*tot_COD*organics_conversion \
+            - self.COD_factor*digestion_yield
 
         # Update stream flows
-        digested.imass['substrates'] *= (1-organics_conversion)
-        digested.imass['active_biomass'] = \
-            sludge.imass['active_biomass']*(1-organics_conversion)
+        digested.mass = sludge_mass
+        digested_mass = digested.mass
+        digested_mass[substrate_idx] = \
+            sludge_mass[substrate_idx].sum()*(1-organics_conversion)*substrate_wt
+        digested_mass[biomass_idx] = biomass*(1-organics_conversion)*biomass_wt
 
         biogas.empty()
         biogas.ivol['CH4'] = methane_vol
@@ -926,20 +1015,17 @@ class SludgeDigester(SanUnit):
         V = design['Volume'] = Q * HRT # m3
         depth = design['depth'] = self.depth # m
         A = design['Surface area'] = V / depth # m2
-        dia = design['Diameter']= (A*4/pi) ** 0.5 # m
+        dia = design['Diameter']= sqrt(A*4/pi) # m
+        perimeter = pi * dia # m
 
         # Calculate needed heating
         T = self.T
-        sludge_T = sludge.T
-        sludge_H_in = sludge.H
-        sludge.T = T
-        sludge_H_at_T = sludge.H
-        sludge.T = sludge_T
-        duty = sludge_H_at_T - sludge_H_in
+        mixture, phase, mol, P = sludge.mixture, sludge.phase, sludge.mol, sludge.P
+        duty = mixture.H(phase, mol, T, P) - mixture.H(phase, mol, sludge.T, P)
 
         # Heat loss
         coeff = self.heat_transfer_coeff
-        A_wall = pi * dia * depth
+        A_wall = perimeter * depth
         wall_loss = coeff['wall'] * A_wall * (T-self.T_air) # [W]
         floor_loss = coeff['floor'] * A * (T-self.T_earth) # [W]
         ceiling_loss = coeff['ceiling'] * A * (T-self.T_air) # [W]
@@ -947,9 +1033,8 @@ class SludgeDigester(SanUnit):
         self.heat_exchanger.simulate_as_auxiliary_exchanger(duty, sludge)
 
         # Concrete usage
-        ft_2_m = auom('ft').conversion_factor('m')
-        design['Wall concrete'] = self.t_wall * pi*(dia*ft_2_m)*(depth*ft_2_m+self.freeboard)
-        design['Slab concrete'] = 2 * self.t_slab * A*(ft_2_m**2) # floor and ceiling
+        design['Wall concrete'] = self.t_wall * (perimeter*_ft_to_m)*(depth*_ft_to_m+self.freeboard)
+        design['Slab concrete'] = 2 * self.t_slab * A*_ft2_to_m2 # floor and ceiling
 
         # Excavation
         design['Excavation'] = calculate_excavation_volume(
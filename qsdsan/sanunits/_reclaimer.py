@@ -26,7 +26,8 @@ for license details.
 
 from math import ceil
 from qsdsan import SanUnit, Construction
-from ..utils import ospath, load_data, data_path, price_ratio
+from ..utils import ospath, data_path, price_ratio
+from ..utils.loading import _load_default_params
 
 __all__ = (
     'ReclaimerECR',
@@ -80,11 +81,8 @@ class ReclaimerECR(SanUnit):
         self.ppl = ppl
         self.if_gridtied = if_gridtied
 
-        data = load_data(path=electrochemical_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(electrochemical_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -170,11 +168,8 @@ class ReclaimerHousing(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
         self.ppl = ppl
 
-        data = load_data(path=housing_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(housing_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -182,12 +177,13 @@ class ReclaimerHousing(SanUnit):
 
     def _design(self):
         design = self.design_results
+        scale = self.ppl / self.baseline_ppl # linear scale
         design['Steel'] = steel_quant = (
             self.steel_weight +
             self.framework_weight/4 +
             self.fittings_weight
-            ) * (self.ppl / self.baseline_ppl)  # linear scale
-        design['Metal'] = metal_quant = self.aluminum_weight * (self.ppl / self.baseline_ppl)  # linear scale
+            ) * scale
+        design['Metal'] = metal_quant = self.aluminum_weight * scale
         self.construction = (
             Construction(item='Steel', quantity=steel_quant, quantity_unit='kg'),
             Construction(item='Metal', quantity=metal_quant, quantity_unit='kg')
@@ -205,11 +201,7 @@ class ReclaimerHousing(SanUnit):
             self.plate_valve +
             self.powder +
             self.container
-            ) * (1 + 0.1 * (self.N_reclaimers-1))
-
-        ratio = self.price_ratio
-        for equipment, cost in C.items():
-            C[equipment] = cost * ratio
+            ) * (1 + 0.1 * (self.N_reclaimers-1)) * self.price_ratio
 
 
     @property
@@ -279,11 +271,8 @@ class ReclaimerIonExchange(SanUnit):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
         self.ppl = ppl
 
-        data = load_data(path=ion_exchange_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(ion_exchange_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -420,11 +409,8 @@ class ReclaimerSolar(SanUnit):
     def __init__(self, ID='', ins=None, outs=(), thermo=None, init_with='WasteStream', **kwargs):
         SanUnit.__init__(self, ID, ins, outs, thermo=thermo, init_with=init_with, F_BM_default=1)
 
-        data = load_data(path=solar_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(solar_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -505,11 +491,8 @@ class ReclaimerSystem(SanUnit):
         self.ppl = ppl
         self.if_gridtied = if_gridtied
 
-        data = load_data(path=system_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(system_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
@@ -614,11 +597,8 @@ class ReclaimerUltrafiltration(SanUnit):
         self.if_gridtied = if_gridtied
         self.ppl = ppl
 
-        data = load_data(path=ultrafiltration_path)
-        for para in data.index:
-            value = float(data.loc[para]['expected'])
-            setattr(self, para, value)
-        del data
+        for attr, value in _load_default_params(ultrafiltration_path):
+            setattr(self, attr, value)
 
         for attr, value in kwargs.items():
             setattr(self, attr, value)
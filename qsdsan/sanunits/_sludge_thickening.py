@@ -14,7 +14,7 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
-import numpy as np, flexsolve as flx
+import numpy as np
 from warnings import warn
 from math import ceil
 from biosteam import Splitter, SolidsCentrifuge
@@ -107,6 +107,8 @@ class SludgeThickening(SanUnit, Splitter):
         mc = self.sludge_moisture
         mixed_F_mass = mixed.F_mass
         if mixed_F_mass == 0: # empty streams
+            eff.empty()
+            sludge.empty()
             split = 0
         else:
             mixed_mc = mixed.imass['Water']/mixed_F_mass
@@ -118,43 +120,26 @@ class SludgeThickening(SanUnit, Splitter):
                 split = 0
                 self.SKIPPED = True
             else:
-                solubles, solids = self.solubles, self.solids
-                sludge.copy_flow(mixed)
-                solids_mass = sludge.imass[solids].sum()
-                sludge.imass[('Water', *solubles)] *= \
+                mixed_mass = mixed.mass.value
+                sludge_mass = mixed_mass.copy()
+                solids_mass = mixed_mass[self._solids_idx].sum()
+                sludge_mass[self._solubles_idx] *= \
                     (solids_mass/(1-mc)-solids_mass)/(mixed_F_mass-solids_mass)
-                eff.mass = mixed.mass - sludge.mass
-                split = mixed.mass.value.copy()
-                idx = np.where(mixed.mass!=0)
-                split[idx] = eff.mass[idx]/mixed.mass[idx]
+                sludge.mass = sludge_mass
+                eff.mass = eff_mass = mixed_mass - sludge_mass
+                split = np.zeros_like(mixed_mass)
+                idx = mixed_mass != 0
+                split[idx] = eff_mass[idx]/mixed_mass[idx]
                 self.SKIPPED = False
         self._isplit = self.thermo.chemicals.isplit(split)
 
 
-    @staticmethod
-    def _mc_at_split(split, solubles, mixed, eff, sludge, target_mc):
-        eff.imass[solubles] = mixed.imass[solubles] * split
-        sludge.imass[solubles] = mixed.imass[solubles] - eff.imass[solubles]
-        mc = sludge.imass['Water'] / sludge.F_mass
-        return mc-target_mc
-
-
     def _run(self):
-        eff, sludge = self.outs
-        solubles, solids = self.solubles, self.solids
-
-        mixed = self._mixed
-        mixed.mix_from(self.ins)
-        eff.T = sludge.T = mixed.T
-        sludge.copy_flow(mixed, solids, remove=True) # all solids go to sludge
-        eff.copy_flow(mixed, solubles)
-
+        # `_set_split_at_mc` solves the sludge/effluent split in closed form
+        # as the split of water and solubles is linear in the moisture content
         self._set_split_at_mc()
-        flx.IQ_interpolation(
-            f=self._mc_at_split, x0=1e-3, x1=1.-1e-3,
-            args=(solubles, mixed, eff, sludge, self.sludge_moisture),
-            checkbounds=False)
-        self._set_split_at_mc() #!!! not sure if still needs this
+        eff, sludge = self.outs
+        eff.T = sludge.T = self._mixed.T
 
 
     def _cost(self):
@@ -172,6 +157,25 @@ class SludgeThickening(SanUnit, Splitter):
             self.power_utility.rate = 0
 
 
+    @property
+    def solids(self):
+        '''[tuple] IDs of the solid components.'''
+        return self._solids
+    @solids.setter
+    def solids(self, i):
+        self._solids = tuple(i)
+        self._solids_idx = np.asarray(self.components.indices(self._solids), dtype=int)
+
+    @property
+    def solubles(self):
+        '''[tuple] IDs of the soluble components, which have the same split as water.'''
+        return self._solubles
+    @solubles.setter
+    def solubles(self, i):
+        self._solubles = tuple(i)
+        self._solubles_idx = np.unique(self.components.indices(('Water', *self._solubles)))
+
+
 class BeltThickener(SludgeThickening):
     '''
     Gravity belt thickener (GBT) designed based on the manufacture specification
@@ -211,18 +211,24 @@ class CSTR(SanUnit):
         if self.split is None: self._outs[0].state = arr
         else:
             for ws, spl in zip(self._outs, self.split):
-                y = arr.copy()
+                y = ws.state
+                if isinstance(y, np.ndarray): y[:] = arr
+                else: # `copy_like` in `_run` leaves a scalar (or None)
+                    ws.state = arr.copy()
+                    y = ws.state
                 y[-1] *= spl
-                ws.state = y
 
     def _update_dstate(self):
         arr = self._dstate
         if self.split is None: self._outs[0].dstate = arr
         else:
             for ws, spl in zip(self._outs, self.split):
-                y = arr.copy()
+                y = ws.dstate
+                if isinstance(y, np.ndarray): y[:] = arr
+                else: # `copy_like` in `_run` leaves a scalar (or None)
+                    ws.dstate = arr.copy()
+                    y = ws.dstate
                 y[-1] *= spl
-                ws.dstate = y
 
     def _run(self):
         '''Only to converge volumetric flows.'''
@@ -28,11 +28,15 @@ __all__ = ('get_correlations', 'define_inputs', 'generate_samples',
 
 import numpy as np
 import pandas as pd
-import seaborn as sns
 import biosteam as bst
-from collections.abc import Iterable
-from warnings import warn
+from collections.abc import Iterable, Sized
+from functools import lru_cache
+from os.path import splitext
+from warnings import catch_warnings, simplefilter, warn
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.stats import rankdata, t as t_dist
 from SALib.sample import (
     morris as morris_sampler,
     fast_sampler,
@@ -55,14 +59,11 @@ indices_to_multiindex = bst.evaluation._model.indices_to_multiindex
 def _update_input(input_val, default_val):
     if input_val is None:
         return default_val
-    else:
-        try:
-            iter(input_val)
-            if len(input_val)==0: # empty iterable
-                return default_val
-            return input_val if not isinstance(input_val, str) else (input_val,)
-        except:
-            return (input_val,)
+    if isinstance(input_val, Iterable) and isinstance(input_val, Sized):
+        if len(input_val)==0: # empty iterable
+            return default_val
+        return input_val if not isinstance(input_val, str) else (input_val,)
+    return (input_val,)
 
 
 def _update_nan(df, nan_policy, legit=('propagate', 'raise', 'omit')):
@@ -78,33 +79,104 @@ def _update_nan(df, nan_policy, legit=('propagate', 'raise', 'omit')):
         return df.fillna(df.dropna().mean())
     return df
 
+def _float_table(table):
+    # Only copy when the table is not all float already
+    if (table.dtypes == np.float64).all(): return table
+    return table.astype('float64')
+
 def _update_df_names(df, columns=True, index=True):
     new_df = df.copy()
 
-    if columns and not new_df.columns.empty:
-        try:
-            iter(new_df.columns)
-            new_df.columns = [i[-1].split(' [')[0] for i in new_df.columns]
-        except: pass
+    # Only (element, name [unit]) multi-indices are renamed
+    if columns and isinstance(new_df.columns, pd.MultiIndex):
+        new_df.columns = [i.split(' [')[0] for i in new_df.columns.get_level_values(-1)]
 
-    if index and not new_df.index.empty:
-        try:
-            iter(new_df.index)
-            new_df.index = [i[-1].split(' [')[0] for i in new_df.index]
-        except: pass
+    if index and isinstance(new_df.index, pd.MultiIndex):
+        new_df.index = [i.split(' [')[0] for i in new_df.index.get_level_values(-1)]
 
     return new_df
 
 
+def _dump_results(dct, file):
+    '''
+    Save each item of `dct` (a table or a dict of tables) as a sheet of an
+    Excel file, with multiple tables stacked in the same sheet, or as
+    parquet files named "<file>_<sheet>_<table>" if `file` ends with
+    ".parquet" or ".pq" (requires ``pyarrow`` or ``fastparquet``).
+    '''
+    root, ext = splitext(file)
+    if ext in ('.parquet', '.pq'):
+        for name, dfs in dct.items():
+            if not isinstance(dfs, dict): dfs = {'': dfs}
+            for key, df in dfs.items():
+                df.to_parquet('_'.join(i for i in (root, name, key) if i)+ext)
+        return
+
+    with pd.ExcelWriter(file) as writer:
+        for name, dfs in dct.items():
+            n_row = 0
+            for df in (dfs.values() if isinstance(dfs, dict) else (dfs,)):
+                df.to_excel(writer, sheet_name=name, startrow=n_row)
+                n_row += len(df.index) + 2 + len(df.columns.names)
+
+
+def _as_arrays(table, param_num, metrics):
+    '''
+    Values of the first `param_num` (i.e., parameter) columns of `table`
+    as a C-contiguous array and values of `metrics` as a Fortran-contiguous
+    array, so that each sample and each metric are contiguous.
+    '''
+    param_val = table.iloc[:, :param_num].to_numpy(dtype='float64')
+    metric_val = table.loc[:, [metric.index for metric in metrics]].to_numpy(dtype='float64')
+    return np.ascontiguousarray(param_val), np.asfortranarray(metric_val)
+
+
+def _analyze_metrics(analyze, args, metric_val, kwargs):
+    '''
+    Run the ``SALib`` `analyze` function with `args` and each column of
+    `metric_val` (i.e., each metric) as the model outputs,
+    return the results as tables.
+    '''
+    return [analyze(*args, Y, **kwargs).to_df() for Y in metric_val.T]
+
+
+def _pearson_r_p(X, Y, alternative='two-sided'):
+    '''
+    Pearson's r and p-values between every column of `X` (n*m1)
+    and every column of `Y` (n*m2), returned as two m1*m2 arrays.
+    '''
+    dof = X.shape[0] - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X = X - X.mean(axis=0)
+        X /= np.linalg.norm(X, axis=0)
+        Y = Y - Y.mean(axis=0)
+        Y /= np.linalg.norm(Y, axis=0)
+        r = np.clip(X.T @ Y, -1., 1.)
+        t = r * np.sqrt(dof/((1.+r)*(1.-r)))
+    if alternative == 'two-sided': p = 2 * t_dist.sf(np.abs(t), dof)
+    elif alternative == 'greater': p = t_dist.sf(t, dof)
+    elif alternative == 'less': p = t_dist.cdf(t, dof)
+    else: raise ValueError("alternative must be 'less', 'greater' or 'two-sided'")
+    return r, p
+
+
 def _save_fig_return(fig, ax, file, close_fig):
     if file:
         fig.savefig(file, dpi=300)
 
     if close_fig:
-        plt.close()
+        plt.close(fig if isinstance(fig, Figure) else None)
 
     return fig, ax
 
+def _agg_subplots(file, close_fig, *args, **kwargs):
+    # Figures that are only saved to the file are created without pyplot,
+    # otherwise return None so that pyplot is used
+    if not (file and close_fig): return None
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig.subplots(*args)
+
 
 # %%
 
@@ -136,7 +208,9 @@ def get_correlations(model, input_x=None, input_y=None,
         - "raise": raise an error.
         - "omit": drop the pair from analysis.
     file : str
-        If provided, the results will be saved as an Excel file.
+        If provided, the results will be saved as an Excel file,
+        or as a single table if the extension is ".csv" or ".parquet"
+        (the latter requires ``pyarrow`` or ``fastparquet``).
     **kwargs : dict
         Other kwargs that will be passed to ``scipy``.
 
@@ -216,15 +290,40 @@ def get_correlations(model, input_x=None, input_y=None,
     else:
         raise ValueError('kind can only be "Spearman", "Pearson", '
                         f'"Kendall", or "KS", not "{kind}".')
-    r_df, p_df = dfs = correlation(input_x, input_y, filter=nan_policy+' nan', **kwargs)
-    for df in dfs:
-        df.index.names = ('Element', 'Input x')
-        df.columns.names = ('Element', 'Input y')
+
+    # Pearson's r and Spearman's rho of all pairs can be calculated at once,
+    # other tests and NaN policies are left to `biosteam`
+    table = model.table
+    if name in ('spearman', 'pearson') and nan_policy == 'propagate' \
+        and kwargs.keys() <= {'alternative'} and table.shape[0] > 2:
+        x_indices = var_indices(input_x or model.parameters)
+        y_indices = var_indices(input_y or model.metrics)
+        X = table[x_indices].to_numpy(dtype='float64')
+        Y = table[y_indices].to_numpy(dtype='float64')
+        nan_pairs = np.logical_or.outer(np.isnan(X).any(axis=0), np.isnan(Y).any(axis=0))
+        if name == 'spearman':
+            X, Y = rankdata(X, axis=0), rankdata(Y, axis=0)
+        r, p = _pearson_r_p(X, Y, kwargs.get('alternative', 'two-sided'))
+        r[nan_pairs] = p[nan_pairs] = np.nan
+        index = indices_to_multiindex(x_indices, ('Element', 'Input x'))
+        columns = indices_to_multiindex(y_indices, ('Element', 'Input y'))
+        r_df = pd.DataFrame(r, index=index, columns=columns)
+        p_df = pd.DataFrame(p, index=index, columns=columns)
+    else:
+        r_df, p_df = dfs = correlation(input_x, input_y, filter=nan_policy+' nan', **kwargs)
+        for df in dfs:
+            df.index.names = ('Element', 'Input x')
+            df.columns.names = ('Element', 'Input y')
 
     if file:
-        with pd.ExcelWriter(file) as writer:
-            r_df.to_excel(writer, sheet_name=sheet_name)
-            p_df.to_excel(writer, sheet_name='p-value')
+        if file.endswith(('.csv', '.parquet')): # one table, coefficients over p-values
+            df = pd.concat({sheet_name: r_df, 'p-value': p_df}, names=('Result',))
+            if file.endswith('.csv'): df.to_csv(file)
+            else: df.to_parquet(file)
+        else:
+            with pd.ExcelWriter(file) as writer:
+                r_df.to_excel(writer, sheet_name=sheet_name)
+                p_df.to_excel(writer, sheet_name='p-value')
     return r_df, p_df
 
 
@@ -337,7 +436,8 @@ def morris_analysis(model, inputs, metrics=None, nan_policy='propagate',
     print_to_console : bool
         Whether to show results in the console.
     file : str
-        If provided, the results will be saved as an Excel file.
+        If provided, the results will be saved as an Excel file,
+        or as parquet files if the extension is ".parquet" or ".pq".
     **kwargs : dict
         Other kwargs that will be passed to ``SALib``.
 
@@ -372,30 +472,22 @@ def morris_analysis(model, inputs, metrics=None, nan_policy='propagate',
     model = model.copy()
     metrics = _update_input(metrics, model.metrics)
     model.metrics = metrics
-    table = model.table.astype('float64')
-    table = _update_nan(table, nan_policy, legit=('propagate', 'raise', 'fill_mean'))
-
-    if isinstance(table, str):
-        table = model.table.astype('float64')
+    table = _float_table(model.table)
+    updated = _update_nan(table, nan_policy, legit=('propagate', 'raise', 'fill_mean'))
+    if not isinstance(updated, str):
+        table = updated
 
-    param_val = table.iloc[:, :len(model.get_parameters())]
-    metric_val = pd.concat([table[metric.index] for metric in metrics], axis=1)
+    param_val, metric_val = _as_arrays(table, len(model.get_parameters()), metrics)
 
-    for metric in metrics:
-        results = metric_val[metric.index]
-        si = morris.analyze(inputs, param_val.to_numpy(), results.to_numpy(),
-                            conf_level=conf_level, print_to_console=print_to_console,
-                            **kwargs)
-        df = si.to_df()
+    kwargs.update(conf_level=conf_level, print_to_console=print_to_console)
+    dfs = _analyze_metrics(morris.analyze, (inputs, param_val), metric_val, kwargs)
+    for metric, df in zip(metrics, dfs):
         df.reset_index(inplace=True)
         df.rename(columns={'index':'parameter'}, inplace=True)
         morris_dct[metric.name] = df
 
     if file:
-        writer = pd.ExcelWriter(file)
-        for name, si_df in morris_dct.items():
-            si_df.to_excel(writer, sheet_name=name)
-        writer.save()
+        _dump_results(morris_dct, file)
 
     return morris_dct
 
@@ -404,7 +496,7 @@ def morris_till_convergence(model, inputs, metrics=None,
                             N_max=20, seed=None, threshold=0.1,
                             nan_policy='propagate',
                             conf_level=0.95, print_to_console=False,
-                            file='', **kwargs):
+                            file='', batch_size=1, **kwargs):
     '''
     Run Morris analysis from N=2 to N=N_max until the results converge
     (i.e., mu_star_conf/mu_star_max < threshold for all parameters,
@@ -438,7 +530,13 @@ def morris_till_convergence(model, inputs, metrics=None,
     print_to_console : bool
         Whether to show results in the console.
     file : str
-        If provided, the results will be saved as an Excel file.
+        If provided, the results will be saved as an Excel file,
+        or as parquet files if the extension is ".parquet" or ".pq".
+    batch_size : int
+        Number of trajectories to be evaluated at a time, larger batches
+        reduce the overhead of model evaluation, but may include trajectories
+        that are not needed when the results converge early
+        (set to `N_max` to evaluate all trajectories at once).
     **kwargs : dict
         Other kwargs that will be passed to ``SALib``.
 
@@ -463,62 +561,83 @@ def morris_till_convergence(model, inputs, metrics=None,
     :func:`qsdsan.stats.morris_analysis`
     '''
 
-    num_levels = kwargs['num_levels'] if 'num_levels' in kwargs.keys() else 4
-    kwargs = {i:kwargs[i] for i in kwargs.keys() if i!='num_levels'}
+    num_levels = kwargs.pop('num_levels', 4)
+    legit = ('propagate', 'raise', 'fill_mean')
+    if not nan_policy in legit:
+        raise ValueError(f'nan_policy can only be in {legit}, not "{nan_policy}".')
+
     samples = generate_samples(inputs=inputs, kind='Morris', N=N_max,
                                seed=seed, num_levels=num_levels)
     model.load_samples(samples)
 
     param_num = len(model.get_parameters())
-    cum_model = model.copy()
-    cum_model.load_samples(samples[0: 2*(param_num+1)])
-    cum_model.evaluate()
-    cum_dct = dict(mu_star={}, mu_star_conf={})
+    traj_len = param_num + 1 # number of samples per trajectory
     metrics = _update_input(metrics, model.metrics)
-    temp_dct = morris_analysis(model=cum_model, inputs=inputs, metrics=metrics,
-                               nan_policy=nan_policy, conf_level=conf_level,
-                               print_to_console=print_to_console,**kwargs)
-    for m in metrics:
-        for idx in ('mu_star', 'mu_star_conf'):
-            data0 = getattr(temp_dct[m.name], idx)
-            df = pd.DataFrame(columns=temp_dct[m.name].parameter, index=(2,))
-            df.index.name = idx
-            df.loc[2] = data0.values
-            cum_dct[idx][m.name] = df
-
+    metric_idx = [model.metrics.index(m) for m in metrics]
+    groups = inputs.get('groups')
+    names = list(dict.fromkeys(groups)) if groups else list(inputs['names'])
+
+    # Model results are cached so that each trajectory is only evaluated once,
+    # the statistics of the cumulative trajectories are then updated by ``SALib``
+    X = np.asarray(samples, dtype='float64')
+    results = np.full((N_max*traj_len, len(model.metrics)), np.nan)
+    temp_model = model.copy() # reused for every batch of trajectories
+    evaluated = [0] # number of trajectories that have been evaluated
+    def evaluate(stop): # add trajectories till `stop`
+        if stop > evaluated[0]:
+            begin = evaluated[0]
+            end = min(max(stop, begin+batch_size), N_max)
+            temp_model.load_samples(samples[begin*traj_len: end*traj_len])
+            temp_model.evaluate()
+            results[begin*traj_len: end*traj_len] = temp_model.table.iloc[:, param_num:].values
+            evaluated[0] = end
+
+        cum_results = results[:stop*traj_len]
+        nan = np.isnan(cum_results)
+        if not nan.any(): return cum_results
+        if nan_policy == 'raise':
+            if nan[:, metric_idx].any():
+                raise ValueError('"NaN" values in model results of the evaluated trajectories, '
+                                 'cannot run analysis.')
+        elif nan_policy == 'fill_mean':
+            valid = ~nan.any(axis=1)
+            mean = cum_results[valid].mean(axis=0) if valid.any() else np.nan
+            return np.where(nan, mean, cum_results)
+        return cum_results
+
+    # Rows are for the number of trajectories (from 2 to N_max)
+    mu_star = np.full((len(metrics), N_max-1, len(names)), np.nan)
+    mu_star_conf = mu_star.copy()
+    def analyze(stop, cum_results):
+        for i, idx in enumerate(metric_idx):
+            si = morris.analyze(inputs, X[:stop*traj_len], cum_results[:, idx],
+                                num_levels=num_levels, conf_level=conf_level,
+                                print_to_console=print_to_console, **kwargs)
+            mu_star[i, stop-2] = si['mu_star']
+            mu_star_conf[i, stop-2] = si['mu_star_conf']
+
+    analyze(2, evaluate(2))
+    stop = 2
     for n in range(2, N_max):
-        temp_model = model.copy()
-        temp_model.load_samples(samples[n*(param_num+1): (n+1)*(param_num+1)])
-        temp_model.evaluate()
-        cum_model.table = pd.concat((cum_model.table, temp_model.table))
-
-        temp_dct = morris_analysis(model=cum_model, inputs=inputs, metrics=metrics,
-                                   nan_policy=nan_policy, conf_level=conf_level,
-                                   print_to_console=print_to_console, **kwargs)
-
-        all_converged = True
-        for m in metrics:
-            mu_star = temp_dct[m.name].mu_star
-            mu_star_conf = temp_dct[m.name].mu_star_conf
-            cum_dct['mu_star'][m.name].loc[n+1] = mu_star.values
-            cum_dct['mu_star_conf'][m.name].loc[n+1] = mu_star_conf.values
-
-            converged = False if (mu_star_conf/mu_star.max()>threshold).any() else True
-            all_converged = all_converged & converged
-
-        if all_converged:
+        stop = n + 1
+        analyze(stop, evaluate(stop))
+
+        ratio = mu_star_conf[:, n-1]/np.nanmax(mu_star[:, n-1], axis=1, keepdims=True)
+        if not (ratio>threshold).any(): # converged for all metrics
             print(f'mu_star converges at # {n+1} trajectories.')
             break
         elif n == N_max-1:
             print(f'mu_star has not converged within {n+1} trajectories.')
 
+    cum_dct = {}
+    for idx, data in (('mu_star', mu_star), ('mu_star_conf', mu_star_conf)):
+        index = pd.Index(range(2, stop+1), name=idx)
+        cum_dct[idx] = {m.name: pd.DataFrame(data[i, :stop-1], index=index, columns=names)
+                        for i, m in enumerate(metrics)}
+
     if file:
-        writer = pd.ExcelWriter(file)
-        for m in metrics:
-            cum_dct['mu_star'][m.name].to_excel(writer, sheet_name=m.name)
-            cum_dct['mu_star_conf'][m.name].to_excel(
-                writer, sheet_name=m.name, startrow=N_max)
-        writer.save()
+        _dump_results({m.name: {idx: cum_dct[idx][m.name] for idx in cum_dct}
+                       for m in metrics}, file)
 
     return cum_dct
 
@@ -556,7 +675,8 @@ def fast_analysis(model, inputs, kind, metrics=None, nan_policy='propagate',
     print_to_console : bool
         Whether to show results in the console.
     file : str
-        If provided, the results will be saved as an Excel file.
+        If provided, the results will be saved as an Excel file,
+        or as parquet files if the extension is ".parquet" or ".pq".
     **kwargs : dict
         Other kwargs that will be passed to ``SALib``.
 
@@ -598,38 +718,24 @@ def fast_analysis(model, inputs, kind, metrics=None, nan_policy='propagate',
     model = model.copy()
     metrics = _update_input(metrics, model.metrics)
     model.metrics = metrics
-    table = model.table.astype('float64')
-    table = _update_nan(table, nan_policy, legit=('propagate', 'raise', 'fill_mean'))
+    table = _float_table(model.table)
+    updated = _update_nan(table, nan_policy, legit=('propagate', 'raise', 'fill_mean'))
+    if not isinstance(updated, str):
+        table = updated
 
-    if isinstance(table, str):
-        table = model.table.astype('float64')
-
-    param_val = table.iloc[:, :len(model.get_parameters())]
-    metric_val = pd.concat([table[metric.index] for metric in metrics], axis=1)
+    param_val, metric_val = _as_arrays(table, len(model.get_parameters()), metrics)
 
+    kwargs.update(conf_level=conf_level, print_to_console=print_to_console)
     if kind.lower() in ('fast', 'efast'):
-        for metric in metrics:
-            results = metric_val[metric.index]
-            si = fast.analyze(inputs, results.to_numpy(), conf_level=conf_level,
-                              print_to_console=print_to_console, **kwargs)
-            fast_dct[metric.name] = si.to_df()
-
+        dfs = _analyze_metrics(fast.analyze, (inputs,), metric_val, kwargs)
     elif kind.lower() == 'rbd':
-        for metric in metrics:
-            results = metric_val[metric.index]
-            si = rbd_fast.analyze(inputs, param_val.to_numpy(), results.to_numpy(),
-                                  conf_level=conf_level, print_to_console=print_to_console,
-                                  **kwargs)
-            fast_dct[metric.name] = si.to_df()
-
+        dfs = _analyze_metrics(rbd_fast.analyze, (inputs, param_val), metric_val, kwargs)
     else:
         raise ValueError(f'kind can only be "FAST" or "RBD", not "{kind}".')
+    fast_dct.update(zip([metric.name for metric in metrics], dfs))
 
     if file:
-        writer = pd.ExcelWriter(file)
-        for name, si_df in fast_dct.items():
-            si_df.to_excel(writer, sheet_name=name)
-        writer.save()
+        _dump_results(fast_dct, file)
 
     return fast_dct
 
@@ -667,7 +773,8 @@ def sobol_analysis(model, inputs, metrics=None, nan_policy='propagate',
     print_to_console : bool
         Whether to show results in the console.
     file : str
-        If provided, the results will be saved as an Excel file.
+        If provided, the results will be saved as an Excel file,
+        or as parquet files if the extension is ".parquet" or ".pq".
     **kwargs : dict
         Other kwargs that will be passed to ``SALib``.
 
@@ -713,29 +820,22 @@ def sobol_analysis(model, inputs, metrics=None, nan_policy='propagate',
     metrics = _update_input(metrics, model.metrics)
     model = model.copy()
     model.metrics = metrics
-    table = model.table.astype('float64')
+    table = _float_table(model.table)
 
-    df = pd.concat([table[metric.index] for metric in metrics], axis=1)
+    df = table.loc[:, [metric.index for metric in metrics]]
     results = _update_nan(df, nan_policy, legit=('propagate', 'raise', 'fill_mean'))
     if isinstance(results, str):
         results = df
+    results = _as_arrays(results, 0, metrics)[1]
 
-    for metric in metrics:
-        result = results[metric.index]
-        si = sobol.analyze(inputs, result.to_numpy(),
-                           calc_second_order=calc_second_order,
-                           conf_level=conf_level, print_to_console=print_to_console,
-                           **kwargs)
-        sobol_dct[metric.name] = dict(zip(('ST', 'S1', 'S2'), si.to_df()))
+    kwargs.update(calc_second_order=calc_second_order, conf_level=conf_level,
+                  print_to_console=print_to_console)
+    dfs = _analyze_metrics(sobol.analyze, (inputs,), results, kwargs)
+    for metric, df in zip(metrics, dfs):
+        sobol_dct[metric.name] = dict(zip(('ST', 'S1', 'S2'), df))
 
     if file:
-        writer = pd.ExcelWriter(file)
-        for name, si_df in sobol_dct.items():
-            n_row = 0
-            for df in si_df.values():
-                df.to_excel(writer, sheet_name=name, startrow=n_row)
-                n_row += len(df.index) + 2 + len(df.columns.names)
-        writer.save()
+        _dump_results(sobol_dct, file)
 
     return sobol_dct
 
@@ -834,28 +934,23 @@ def plot_uncertainties(model, x_axis=(), y_axis=(), kind='box', adjust_hue=False
 
     :func:`seaborn.jointplot` `docs <https://seaborn.pydata.org/generated/seaborn.jointplot.html>`_
     '''
+    import seaborn as sns
 
     kind_lower = kind.lower()
-    table = model.table.astype('float64')
-    df = _update_df_names(table)
+    df = _update_df_names(_float_table(model.table))
 
     twoD = False
     x_df = y_df = None
-    sns_df = pd.DataFrame(columns=('x_group', 'x_data', 'y_group', 'y_data'))
 
     if not y_axis: # no data provided or only x, 1D, horizontal
         x_axis = _update_input(x_axis, model.metrics)
         x_df = df[[i.name for i in x_axis]]
-        temp_df = x_df.stack(dropna=False).reset_index(name='x_data')
-        sns_df['x_data'] = temp_df['x_data']
-        sns_df['x_group'] = temp_df['level_1']
+        sns_df = x_df.melt(var_name='x_group', value_name='x_data')
 
     elif not x_axis: # only y, 1D, vertical
         y_axis = (y_axis,) if not isinstance(y_axis, Iterable) else y_axis
         y_df = df[[i.name for i in y_axis]]
-        temp_df = y_df.stack(dropna=False).reset_index(name='y_data')
-        sns_df['y_data'] = temp_df['y_data']
-        sns_df['y_group'] = temp_df['level_1']
+        sns_df = y_df.melt(var_name='y_group', value_name='y_data')
 
     else: # x and y, 2D
         len_x = len_y = 1
@@ -968,6 +1063,7 @@ def _plot_corr_tornado(corr_df, top, **kwargs):
 
 
 def _plot_corr_bubble(corr_df, ratio, **kwargs):
+    import seaborn as sns
     sns.set_theme(style="whitegrid")
 
     margin_x = kwargs['margin_x'] if 'margin_x' in kwargs.keys() else 0.1/ratio
@@ -1067,9 +1163,8 @@ def plot_correlations(result_df, parameters=(), metrics=(), top=None,
         return _save_fig_return(fig, ax, file, close_fig)
 
     else: # multiple metrics, bubble plot
-        corr_df = df.stack(dropna=False).reset_index()
-        corr_df.rename(columns={'level_0': 'parameter', 'level_1': 'metric',
-                                0: 'correlation'}, inplace=True)
+        corr_df = df.rename_axis('parameter').reset_index().melt(
+            id_vars='parameter', var_name='metric', value_name='correlation')
         corr_df['size'] = corr_df['correlation'].abs()
 
         g = _plot_corr_bubble(corr_df, len(metric_names)/len(param_names), **kwargs)
@@ -1085,7 +1180,8 @@ def plot_correlations(result_df, parameters=(), metrics=(), top=None,
 def plot_morris_results(morris_dct, metric, kind='scatter', ax=None,
                         x_axis='mu_star', plot_lines=True,
                         k1=0.1, k2=0.5, k3=1, label_kind='number',
-                        color='k', file='', close_fig=True, **kwargs):
+                        color='k', file='', close_fig=True, max_labels=20,
+                        **kwargs):
     '''
     Visualize the results from Morris One-at-A-Time analysis as either scatter
     or bar plots.
@@ -1125,6 +1221,9 @@ def plot_morris_results(morris_dct, metric, kind='scatter', ax=None,
     close_fig : bool
         Whether to close the figure
         (if not close, new figure will be overlaid on the current figure).
+    max_labels : int
+        Only label the points with the largest absolute x values
+        (up to this number) in the scatter plot, None to label all points.
     **kwargs : dict
         Other kwargs that will be passed to :func:`morris.horizontal_bar_plot` in ``SALib.plotting``.
 
@@ -1141,6 +1240,7 @@ def plot_morris_results(morris_dct, metric, kind='scatter', ax=None,
 
     `qsdsan.stats <https://qsdsan.readthedocs.io/en/latest/stats.html>`_
     '''
+    import seaborn as sns
 
     df = morris_dct[metric.name]
     x_data = getattr(df, x_axis)
@@ -1162,9 +1262,13 @@ def plot_morris_results(morris_dct, metric, kind='scatter', ax=None,
                         color=color)
         else:
             ax.scatter(x_data, y_data, color=color)
-        for x, y, label in zip(x_data, y_data, labels):
-            ax.annotate(label, (x, y), xytext=(10, 10), textcoords='offset points',
-                        ha='center')
+        labeled = np.arange(len(labels))
+        if max_labels is not None and len(labels) > max_labels:
+            labeled = np.argsort(-np.abs(x_data.to_numpy()), kind='stable')[:max_labels]
+        x_vals, y_vals, labels = x_data.to_numpy(), y_data.to_numpy(), np.asarray(labels)
+        for i in labeled:
+            ax.annotate(labels[i], (x_vals[i], y_vals[i]), xytext=(10, 10),
+                        textcoords='offset points', ha='center')
 
         lines, legends = [], []
         line_color = kwargs.get('line_color') or color
@@ -1257,10 +1361,11 @@ def plot_morris_convergence(result_dct, metric, parameters=(),
 
     `qsdsan.stats <https://qsdsan.readthedocs.io/en/latest/stats.html>`_
     '''
+    import seaborn as sns
 
     ax = ax if ax is not None else plt.subplot()
-    df = result_dct['mu_star'][metric.name].copy().astype('float64')
-    conf_df = result_dct['mu_star_conf'][metric.name].copy().astype('float64')
+    df = result_dct['mu_star'][metric.name].astype('float64')
+    conf_df = result_dct['mu_star_conf'][metric.name]
 
     param_names = _update_input(parameters, df.columns)
     param_names = param_names if isinstance(param_names[0], str) \
@@ -1277,19 +1382,23 @@ def plot_morris_convergence(result_dct, metric, parameters=(),
     palette = sns.color_palette('deep', n_colors=len(param_names))
     sns.set_theme(style='ticks', palette=palette)
 
+    if kind not in ('line', 'scatter'):
+        raise ValueError(f'kind can only be "line" or "scatter", not "{kind}".')
+
+    x_vals = df.index.to_numpy()
+    y_vals = df[param_names].to_numpy()
+    conf_vals = conf_df[param_names].to_numpy(dtype='float64')
     for n, param in enumerate(param_names):
+        y, conf = y_vals[:, n], conf_vals[:, n]
         if kind == 'line':
-            ax.plot(df.index, df[param], color=palette[n], linewidth=1.5, label=param)
+            ax.plot(x_vals, y, color=palette[n], linewidth=1.5, label=param)
             if not plot_rank and show_error:
-                ax.fill_between(df.index, df[param]-conf_df[param], df[param]+conf_df[param],
+                ax.fill_between(x_vals, y-conf, y+conf,
                                 color=palette[n], linewidth=0, alpha=0.2)
-        elif kind == 'scatter':
-            ax.scatter(df.index, df[param], color=palette[n], label=param)
-            if not plot_rank and show_error:
-                ax.errorbar(df.index, df[param], conf_df[param],
-                            color=palette[n], alpha=0.5)
         else:
-            raise ValueError(f'kind can only be "line" or "scatter", not "{kind}".')
+            ax.scatter(x_vals, y, color=palette[n], label=param)
+            if not plot_rank and show_error:
+                ax.errorbar(x_vals, y, conf, color=palette[n], alpha=0.5)
 
     ax.legend(loc=loc)
     ax.set(xlabel='Number of trajectories', ylabel=ylabel, ylim=(0, ax.get_ylim()[1]))
@@ -1301,24 +1410,33 @@ def plot_morris_convergence(result_dct, metric, parameters=(),
 # Plot variance breakdown
 # =============================================================================
 
+# Built on first use rather than for every plot (seaborn is only imported for plotting),
+# bar colors are desaturated to match `sns.barplot`
+@lru_cache(maxsize=None)
+def _sobol_styles():
+    import seaborn as sns
+    cmap = sns.diverging_palette(230, 20, as_cmap=True)
+    bars = tuple(
+        (index, label, sns.desaturate(color, .75), color) for index, label, color in (
+            ('ST', 'Total', sns.color_palette('pastel6')[0]),
+            ('S1', 'Main', sns.color_palette('muted6')[0]),
+            ))
+    return cmap, bars
+
 def _plot_bar(kind, df, error, ax=None):
     ax = ax if ax else plt.subplot()
 
-    sns.set_theme(style='white')
-    if 'ST' in kind:
-        sns.set_color_codes('pastel')
-        sns.barplot(x=df.ST, y=df.index, data=df,
-                    ax=ax, label='Total', color='b')
-        if error:
-            ax.errorbar(df.ST, df.index, xerr=df.ST_conf, fmt='none', ecolor='b')
-
-    if 'S1' in kind:
-        sns.set_color_codes('muted')
-        sns.barplot(x=df.S1, y=df.index, data=df,
-                    ax=ax, label='Main', color='b')
-        if error:
-            ax.errorbar(df.S1, df.index, xerr=df.S1_conf, fmt='none', ecolor='b')
-
+    # Plain `barh` as there is only one value per parameter,
+    # main effects are overlaid on total effects
+    y = np.arange(df.shape[0])
+    for index, label, color, ecolor in _sobol_styles()[1]:
+        if index not in kind: continue
+        xerr = df[f'{index}_conf'].to_numpy() if error else None
+        ax.barh(y, df[index].to_numpy(), color=color, label=label,
+                xerr=xerr, error_kw={'ecolor': ecolor})
+
+    ax.set_yticks(y)
+    ax.set_yticklabels(df.index)
     ax.set_xlabel('Variance')
     ax.legend(ncol=2, loc='lower right', frameon=True)
     ax.set_ylim(df.shape[0]-0.5, -0.5)
@@ -1327,26 +1445,28 @@ def _plot_bar(kind, df, error, ax=None):
 
 def _plot_heatmap(hmap_df, ax=None, annot=False, diagonal='', sts1_df=None,
                   default_cbar=True):
+    import seaborn as sns
     ax = ax if ax else plt.subplot()
     ax_cbar = ax.figure.add_axes([0.03, 0.3, 0.02, 0.4]) if not default_cbar else None
 
     if diagonal:
-        np.fill_diagonal(hmap_df.values, getattr(sts1_df, diagonal))
-        hmap_df = hmap_df.astype('float64')
+        # `hmap_df` is already float, one working copy so the caller's table is untouched
+        values = hmap_df.to_numpy(dtype='float64', copy=True)
+        np.fill_diagonal(values, getattr(sts1_df, diagonal).to_numpy())
+        hmap_df = pd.DataFrame(values, index=hmap_df.index, columns=hmap_df.columns)
         k = -1
         title = 'Total/Interaction Effects' if diagonal=='ST' else 'Main/Interaction Effects'
     else:
-        hmap_df = hmap_df.fillna(0)
         k = 0
         title = 'Interaction Effects'
 
-    mask = np.tril(np.ones_like(hmap_df, dtype=bool), k)
+    # NaN cells are masked by `sns.heatmap` together with the lower triangle,
+    # so they are left blank and kept out of the color scaling
+    mask = np.tril(np.ones(hmap_df.shape, dtype=bool), k)
 
-    sns.set_theme(style='white')
-    cmap = sns.diverging_palette(230, 20, as_cmap=True)
     sns.heatmap(hmap_df,
                 mask=mask,
-                ax=ax, cmap=cmap, center=0, linewidths=.5,
+                ax=ax, cmap=_sobol_styles()[0], center=0, linewidths=.5,
                 annot=annot, cbar_kws={'shrink': 0.5}, cbar_ax=ax_cbar)
     ax.set_title(title)
 
@@ -1391,19 +1511,23 @@ def plot_fast_results(result_dct, metric, parameters=(),
 
     `qsdsan.stats <https://qsdsan.readthedocs.io/en/latest/stats.html>`_
     '''
+    import seaborn as sns
 
-    param_names = _update_input(parameters, result_dct[metric.name]['S1'].index)
+    df = result_dct[metric.name]
+    param_names = _update_input(parameters, df.index)
     param_names = param_names if isinstance(param_names[0], str) \
                               else [p.name for p in param_names]
 
-    df = result_dct[metric.name]
     kind = 'STS1' if 'ST' in df.columns else 'S1'
 
+    sns.set_theme(style='white')
     ax = _plot_bar(kind, df, error_bar, ax=ax)
 
     return _save_fig_return(ax.figure, ax, file, close_fig)
 
 
+_sobol_kind_chars = frozenset('STS1S2')
+
 def plot_sobol_results(result_dct, metric, ax=None,
                        parameters=(), kind='all',
                        annotate_heatmap=False, plot_in_diagonal='',
@@ -1475,37 +1599,56 @@ def plot_sobol_results(result_dct, metric, ax=None,
 
     `qsdsan.stats <https://qsdsan.readthedocs.io/en/latest/stats.html>`_
     '''
+    import seaborn as sns
 
     kind_upper = kind.upper()
-    if kind_upper=='ALL' or set(kind_upper)==set('STS1S2'):
+    kind_chars = set(kind_upper)
+    if kind_upper=='ALL' or kind_chars==_sobol_kind_chars:
         kind_upper = 'STS1S2'
-    elif not set(kind_upper).union(set('STS1S2'))==set('STS1S2'):
+    elif not kind_chars <= _sobol_kind_chars:
         raise ValueError(f'The plot kind of "{kind}" is invalid.')
 
+    sns.set_theme(style='white')
     ax_sts1 = ax_s2 = None
 
-    param_names = _update_input(parameters, result_dct[metric.name]['ST'].index)
+    results = result_dct[metric.name]
+    param_names = _update_input(parameters, results['ST'].index)
     param_names = param_names if isinstance(param_names[0], str) \
                               else [p.name for p in param_names]
 
-    st_df = result_dct[metric.name]['ST'].loc[[p for p in param_names]]
-    s1_df = result_dct[metric.name]['S1'].loc[[p for p in param_names]]
-    sts1_df = pd.concat((st_df, s1_df), axis=1).sort_values('ST', ascending=False)
+    # ST and S1 tables share the same parameter index, locate the rows once
+    st_df = results['ST']
+    pos = st_df.index.get_indexer(param_names)
+    if (pos < 0).any():
+        missing = [p for p, i in zip(param_names, pos) if i < 0]
+        raise KeyError(f'Parameters {missing} are not in the results.')
+    # Descending by ST (NaN last) in the same positional pass
+    pos = pos[np.argsort(-st_df.ST.to_numpy()[pos], kind='stable')]
+    sts1_df = pd.concat((st_df.iloc[pos], results['S1'].iloc[pos]), axis=1, copy=False)
 
     if kind_upper in ('ST', 'S1', 'STS1', 'S1ST'): # no S2, bar plot only
-        ax_sts1 = _plot_bar(kind_upper, sts1_df, error_bar)
+        ax_sts1 = _plot_bar(kind_upper, sts1_df, error_bar,
+                            ax=_agg_subplots(file, close_fig))
         return _save_fig_return(ax_sts1.figure, ax_sts1, file, close_fig)
 
     else: # has S2, need heat map
-        s2_df = result_dct[metric.name]['S2']
-        hmap_df = pd.DataFrame(columns=sts1_df.index, index=sts1_df.index)
-        for (p1, p2) in s2_df.index:
-            if not (p1 in hmap_df.index and p2 in hmap_df.index):
-                continue
-            hmap_df[p1][p2] = hmap_df[p2][p1] = s2_df.S2[(p1, p2)]
+        s2_df = results['S2']
+        names = sts1_df.index
+        hmap = np.full((names.size, names.size), np.nan)
+        if len(s2_df): # no pairs for a single parameter
+            # Positions of the (p1, p2) pairs among the plotted parameters,
+            # pairs involving parameters not being plotted are dropped
+            pairs = pd.MultiIndex.from_tuples(s2_df.index)
+            i = names.get_indexer(pairs.get_level_values(0))
+            j = names.get_indexer(pairs.get_level_values(1))
+            kept = (i >= 0) & (j >= 0)
+            i, j = i[kept], j[kept]
+            hmap[i, j] = hmap[j, i] = s2_df.S2.to_numpy(dtype='float64')[kept]
+        hmap_df = pd.DataFrame(hmap, index=names, columns=names)
 
         if kind_upper == 'S2': # only S2, only heat map
-            ax_s2 = _plot_heatmap(hmap_df, annot=annotate_heatmap)
+            ax_s2 = _plot_heatmap(hmap_df, ax=_agg_subplots(file, close_fig),
+                                  annot=annotate_heatmap)
             return _save_fig_return(ax_s2.figure, ax_s2, file, close_fig)
 
         else: # has S2, need heat map
@@ -1513,7 +1656,8 @@ def plot_sobol_results(result_dct, metric, ax=None,
 
             plot_in_diagonal = plot_in_diagonal.upper()
             if not_s2 and not_s2 == plot_in_diagonal: # ST or S1 in heat map, only heat map
-                ax_s2 = _plot_heatmap(hmap_df, ax=ax_s2, annot=annotate_heatmap,
+                ax_s2 = _plot_heatmap(hmap_df, ax=_agg_subplots(file, close_fig),
+                                      annot=annotate_heatmap,
                                       diagonal=plot_in_diagonal,
                                       sts1_df=sts1_df, default_cbar=True)
                 return _save_fig_return(ax_s2.figure, ax_s2, file, close_fig)
@@ -1528,7 +1672,12 @@ def plot_sobol_results(result_dct, metric, ax=None,
                 raise ValueError('plot_in_diagonal must be "ST", "S1", or "", '\
                                  f'not "{plot_in_diagonal}".')
 
-            fig, (ax_s2, ax_sts1) = plt.subplots(1, 2, figsize=(8, 5))
+            axes = _agg_subplots(file, close_fig, 1, 2, figsize=(8, 5))
+            if axes is None:
+                fig, axes = plt.subplots(1, 2, figsize=(8, 5))
+            else:
+                fig = axes[0].figure
+            ax_s2, ax_sts1 = axes
             bar = not_s2.replace(plot_in_diagonal, '') # 'ST', 'S1', or 'STS1'
 
             ax_sts1 = _plot_bar(bar, sts1_df, error_bar, ax=ax_sts1)
@@ -1545,7 +1694,8 @@ def plot_sobol_results(result_dct, metric, ax=None,
                                         diagonal=plot_in_diagonal,
                                         sts1_df=sts1_df, default_cbar=False)
 
-            labels = [i if len(i)<=15 else i[0:15]+'...' for i in hmap_df.index]
+            names = hmap_df.index.to_series()
+            labels = names.where(names.str.len()<=15, names.str[:15]+'...').tolist()
             ax_s2.yaxis.set_label_position('right')
             ax_s2.yaxis.tick_right()
             ax_s2.set_yticklabels(labels, rotation=0, ha='center',
@@ -1556,9 +1706,12 @@ def plot_sobol_results(result_dct, metric, ax=None,
             xlabels[0] = '' if not plot_in_diagonal else xlabels[0]
             ax_s2.set_xticklabels(xlabels)
 
-            try: plt.tight_layout()
-            except AttributeError: pass # when no results
-            plt.subplots_adjust(wspace=0.4, top=0.85)
+            # The colorbar axes is placed by hand and ignored by `tight_layout`
+            with catch_warnings():
+                simplefilter('ignore', UserWarning)
+                try: fig.tight_layout()
+                except AttributeError: pass # when no results
+            fig.subplots_adjust(wspace=0.4, top=0.85)
             fig.suptitle(f'Variance breakdown for {metric.name.lower()}')
 
         return _save_fig_return(fig, (ax_sts1, ax_s2), file, close_fig)
\ No newline at end of file
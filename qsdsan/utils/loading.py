@@ -19,6 +19,7 @@ data_path = ospath.join(qs_path, 'data')
 
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from warnings import warn
 from .. import _pk
 
@@ -58,6 +59,17 @@ def load_data(path=None, sheet=None, index_col=0, **kwargs):
     return data
 
 
+@lru_cache(maxsize=None)
+def _load_default_params(path, prefix=''):
+    '''
+    Return the (attribute name, expected value) pairs in the data file at `path`,
+    with `prefix` prepended to the attribute names.
+    '''
+    data = load_data(path=path)['expected'].astype(float)
+    return tuple((prefix+para, value) for para, value
+                 in zip(data.index, data.to_numpy().tolist()))
+
+
 
 # %%
 
@@ -14,7 +14,7 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
-__all__ = ('test_dyn_sys',)
+__all__ = ('test_dyn_sys', 'test_CSTR_split', 'test_AnaerobicCSTR')
 
 def test_dyn_sys():
     from qsdsan import processes as pc, sanunits as su, set_thermo, System
@@ -37,5 +37,92 @@ def test_dyn_sys():
     assert_allclose(deff.scope.record, dinf.scope.record, rtol=1e-12)
 
 
+def test_CSTR_split():
+    from qsdsan import processes as pc, sanunits as su, System
+    import numpy as np
+    from numpy.testing import assert_allclose
+
+    cmps = pc.create_asm1_cmps()
+    asm1 = pc.ASM1()
+    DI = su.DynamicInfluent('Dyn_Inf')
+    R1 = su.CSTR('R1', ins=DI-0, outs=('R1_eff', 'R1_was'), split=[0.7, 0.3],
+                 V_max=1000, aeration=2.0, DO_ID='S_O', suspended_growth_model=asm1)
+    sys = System('cstr_sys', path=(DI, R1))
+    sys.set_dynamic_tracker(*R1.outs)
+    sys.simulate(t_span=(0, 1), method='BDF')
+
+    eff, was = R1.outs
+    idx = cmps.indices(('S_S', 'X_S', 'X_BH', 'X_BA', 'S_NH'))
+    assert_allclose(eff.state[idx], was.state[idx], rtol=1e-12)
+    assert_allclose(eff.state[idx],
+                    (69.78117938555239, 228.69160753342248, 37.5516407099955,
+                     0, 33.03631014029654), rtol=1e-6)
+    assert_allclose((eff.state[-1], was.state[-1]),
+                    (12696.281485783906, 5441.263493907388), rtol=1e-6)
+    assert_allclose(was.dstate[idx],
+                    (-185.13626704973242, -24.409361679814708, -6.354981915657689,
+                     0, -47.45886680272045), rtol=1e-6, atol=1e-8)
+    assert_allclose(eff.scope.record[-1, idx], eff.state[idx], rtol=1e-12)
+
+    # Outlets are updated in place and do not share arrays
+    y_eff, y_was = eff.state, was.state
+    assert y_eff is not y_was
+    R1._state[:] = np.arange(len(R1._state))
+    R1._update_state()
+    assert eff.state is y_eff and was.state is y_was
+    assert_allclose(eff.state[:-1], was.state[:-1], rtol=0)
+    assert_allclose((eff.state[-1], was.state[-1]), (10.5, 4.5), rtol=1e-12)
+
+
+def test_AnaerobicCSTR():
+    from qsdsan import processes as pc, sanunits as su, WasteStream, System
+    from qsdsan.sanunits._anaerobic_reactors import \
+        _production_rates_dense, _production_rates_csr
+    import numpy as np
+    from numpy.testing import assert_allclose
+    from scipy.sparse import csr_matrix
+
+    cmps = pc.create_adm1_cmps()
+    adm1 = pc.ADM1()
+    inf = WasteStream('Influent', T=308.15)
+    inf.set_flow_by_concentration(
+        170, concentrations={'S_su': 0.01, 'S_IC': 0.48, 'S_IN': 0.14,
+                             'X_ch': 5, 'X_pr': 20, 'X_li': 5, 'X_I': 25,
+                             'S_cat': 0.04, 'S_an': 0.02},
+        units=('m3/d', 'kg/m3'))
+    AD = su.AnaerobicCSTR('AD', ins=inf, outs=('biogas', 'effluent'), model=adm1)
+    AD.set_init_conc(S_ac=89.3, S_IC=1142, S_IN=1324, X_ch=20.5, X_pr=84.2, X_li=43.6,
+                     X_su=312.2, X_aa=931.7, X_fa=338.4, X_c4=325.8, X_pro=101.1,
+                     X_ac=677.2, X_h2=284.8, X_I=17216.2)
+    sys = System('AD_sys', path=(AD,))
+    # ADM1 has a sparse, constant stoichiometry, i.e., the CSR path
+    sys.simulate(t_span=(0, 10), method='BDF')
+
+    bg, eff = AD.outs
+    assert_allclose(eff.state[cmps.indices(('S_su', 'S_ac', 'S_IC', 'X_ac', 'X_h2'))],
+                    (13.401245244003805, 33.4167110859342, 2420.9046952635927,
+                     700.3124625920947, 292.88664594498505), rtol=1e-6)
+    assert_allclose(bg.state[cmps.indices(('S_h2', 'S_ch4', 'S_IC'))],
+                    (5.8452441135214165e-03, 2.4363913379855358e+03,
+                     5.7710543891201347e+00), rtol=1e-6)
+    assert_allclose((eff.state[-1], bg.state[-1]),
+                    (170.0000025331974, 1550.4700897094658), rtol=1e-6)
+    assert_allclose(AD._state[-4:-1],
+                    (3.653414573997410e-07, 3.807004228260960e-02,
+                     4.804927597159312e-04), rtol=1e-6)
+
+    # Dense (dynamic stoichiometry) and CSR production rates
+    M = adm1.stoichio_eval()
+    rhos = adm1.rate_function(AD._state)
+    M_T_csr = csr_matrix(M.T)
+    rxn_dense, rxn_csr = np.empty(M.shape[1]), np.empty(M.shape[1])
+    _production_rates_dense(M, rhos, rxn_dense)
+    _production_rates_csr(M_T_csr.indptr, M_T_csr.indices, M_T_csr.data, rhos, rxn_csr)
+    assert_allclose(rxn_dense, rhos @ M, rtol=1e-12, atol=1e-12)
+    assert_allclose(rxn_csr, rhos @ M, rtol=1e-12, atol=1e-12)
+
+
 if __name__ == '__main__':
-    test_dyn_sys()
\ No newline at end of file
+    test_dyn_sys()
+    test_CSTR_split()
+    test_AnaerobicCSTR()
\ No newline at end of file
@@ -12,7 +12,7 @@ Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
 for license details.
 '''
 
-__all__ = ('test_sanunit',)
+__all__ = ('test_sanunit', 'test_SludgeDigester', 'test_SludgeThickening')
 
 def test_sanunit():
     from numpy.testing import assert_allclose
@@ -56,5 +56,76 @@ def test_sanunit():
     assert_allclose(M4.installed_cost, 7237.455247692897, rtol=1e-2)
 
 
+
+def test_SludgeDigester():
+    from numpy.testing import assert_allclose
+    import qsdsan as qs
+    cmps = qs.Components.load_default(default_compile=False)
+    CO2 = qs.Component('CO2', search_ID='CO2', phase='g', particle_size='Dissolved gas',
+                       degradability='Undegradable', organic=False)
+    cmps = qs.Components([*cmps, CO2])
+    cmps.default_compile()
+    cmps.define_group('substrates', ('S_F', 'X_B_Subst'))
+    cmps.define_group('active_biomass', ('X_OHO', 'X_AOO'))
+    qs.set_thermo(cmps)
+
+    sludge = qs.WasteStream(X_OHO=10, X_AOO=3, S_F=2, X_B_Subst=5, H2O=1000, T=290)
+    AD = qs.sanunits.SludgeDigester('AD', ins=sludge)
+    for _ in range(2): # results should not depend on the previous run
+        AD.simulate()
+        digested, biogas = AD.outs
+        assert_allclose(digested.imass['X_OHO', 'X_AOO', 'S_F', 'X_B_Subst', 'H2O'],
+                        (1.95, 1.95, 1.05, 1.05, 1000), rtol=1e-12)
+        assert_allclose(biogas.ivol['CH4', 'CO2'],
+                        (140722.512, 75773.66030769229), rtol=1e-12)
+
+    design = AD.design_results
+    assert_allclose([design[i] for i in ('Volume', 'Diameter', 'Wall concrete', 'Slab concrete')],
+                    (491.2746965210754, 7.908921360959402, 22.901497409954416, 6.085455037584708),
+                    rtol=1e-12)
+    assert_allclose(AD.installed_cost, 258260.14240859795, rtol=1e-12)
+    # Heating duty at a larger and a smaller temperature difference
+    assert_allclose(AD.heat_utilities[0].duty, 131634.85605763303, rtol=1e-12)
+    sludge.T = 303
+    AD.simulate()
+    assert_allclose(AD.heat_utilities[0].duty, 53831.838055555425, rtol=1e-12)
+    assert sludge.T == 303
+
+
+
+def test_SludgeThickening():
+    from numpy.testing import assert_allclose
+    import qsdsan as qs
+    components = qs.Components.load_default()
+    qs.set_thermo(components)
+
+    ws1 = qs.WasteStream(X_OHO=10, X_AOO=3, S_F=4, S_NH4=2, H2O=1000, T=300)
+    ws2 = qs.WasteStream(X_OHO=1, H2O=10, T=290)
+    IDs = ('X_OHO', 'S_F', 'S_NH4', 'H2O')
+    # Same as the split solved iteratively by `flexsolve.IQ_interpolation`
+    T1 = qs.sanunits.SludgeThickening('T1', ins=ws1.copy(), sludge_moisture=0.96)
+    T2 = qs.sanunits.BeltThickener('T2', ins=(ws1, ws2), sludge_moisture=0.96)
+    for U, eff_mass, sludge_mass in (
+            (T1, (0, 2.7594433399602396, 1.3797216699801198, 689.8608349900599),
+             (10, 1.2405566600397604, 0.6202783300198802, 310.13916500994014)),
+            (T2, (0, 2.6771653543307097, 1.3385826771653548, 675.9842519685042),
+             (11, 1.3228346456692903, 0.6614173228346452, 334.0157480314958)),
+            ):
+        for _ in range(2): # persistent streams are reused in the next run
+            U._run()
+            eff, sludge = U.outs
+            assert_allclose(eff.imass[IDs], eff_mass, rtol=1e-12, atol=1e-12)
+            assert_allclose(sludge.imass[IDs], sludge_mass, rtol=1e-12)
+            assert eff.T == sludge.T
+    assert_allclose(T2.outs[1].T, 299.7902713326735, rtol=1e-12)
+
+    # Empty feeds give empty outlets
+    T1.ins[0].empty()
+    T1._run()
+    assert T1.outs[0].F_mass == T1.outs[1].F_mass == 0
+
+
 if __name__ == '__main__':
-    test_sanunit()
\ No newline at end of file
+    test_sanunit()
+    test_SludgeDigester()
+    test_SludgeThickening()
\ No newline at end of file
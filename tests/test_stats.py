@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+QSDsan: Quantitative Sustainable Design for sanitation and resource recovery systems
+
+This module is developed by:
+    Yalin Li <mailto.yalin.li@gmail.com>
+
+This module is under the University of Illinois/NCSA Open Source License.
+Please refer to https://github.com/QSD-Group/QSDsan/blob/main/LICENSE.txt
+for license details.
+'''
+
+__all__ = ('test_get_correlations', 'test_sobol_analysis', 'test_plot_sobol_results',
+           'test_morris_till_convergence')
+
+
+def test_get_correlations():
+    import pytest, numpy as np
+    from numpy.testing import assert_allclose
+    from qsdsan import stats as s
+    from qsdsan.utils import load_example_model
+
+    model = load_example_model(evaluate=True, N=100, rule='L', seed=554)
+    model.table.iloc[[1, 8], 0] = np.nan
+    model.table.iloc[[2, 3], -1] = np.nan
+
+    for kind, corr in (('Spearman', model.spearman_r), ('Pearson', model.pearson_r)):
+        for nan_policy in ('propagate', 'omit'):
+            r1, p1 = s.get_correlations(model, kind=kind, nan_policy=nan_policy)
+            r2, p2 = corr(None, None, filter=f'{nan_policy} nan')
+            assert (r1.index == r2.index).all() and (r1.columns == r2.columns).all()
+            assert_allclose(r1.values, r2.values, rtol=1e-10, atol=1e-12)
+            assert_allclose(p1.values, p2.values, rtol=1e-7, atol=1e-12)
+
+        with pytest.raises(ValueError):
+            s.get_correlations(model, kind=kind, nan_policy='raise')
+        # No NaN in these inputs
+        p, m = model.parameters[1:], model.metrics[:-1]
+        r1, p1 = s.get_correlations(model, input_x=p, input_y=m, kind=kind, nan_policy='raise')
+        r2, p2 = corr(p, m, filter='raise nan')
+        assert_allclose(r1.values, r2.values, rtol=1e-10, atol=1e-12)
+        assert_allclose(p1.values, p2.values, rtol=1e-7, atol=1e-12)
+
+
+def test_sobol_analysis():
+    from numpy.testing import assert_allclose
+    from SALib.analyze import sobol
+    from qsdsan import stats as s
+    from qsdsan.utils import load_example_model
+
+    model = load_example_model(evaluate=False)
+    inputs = s.define_inputs(model)
+    samples = s.generate_samples(inputs, kind='Sobol', N=16, calc_second_order=True)
+    model.load_samples(samples)
+    model.evaluate()
+    dct = s.sobol_analysis(model, inputs, seed=554, calc_second_order=True)
+    for metric in model.metrics:
+        Y = model.table[metric.index].to_numpy()
+        dfs = sobol.analyze(inputs, Y, calc_second_order=True, seed=554).to_df()
+        for key, df in zip(('ST', 'S1', 'S2'), dfs):
+            assert_allclose(dct[metric.name][key].values, df.values, rtol=1e-12)
+
+
+def test_plot_sobol_results():
+    import os, tempfile
+    from matplotlib import pyplot as plt
+    from qsdsan import stats as s
+    from qsdsan.utils import load_example_model
+
+    model = load_example_model(evaluate=False)
+    inputs = s.define_inputs(model)
+    samples = s.generate_samples(inputs, kind='Sobol', N=16, calc_second_order=True)
+    model.load_samples(samples)
+    model.evaluate()
+    dct = s.sobol_analysis(model, inputs, seed=554, calc_second_order=True)
+    metric = model.metrics[0]
+
+    plt.close('all')
+    with tempfile.TemporaryDirectory() as tmp:
+        # Figures only saved to the file are not registered with pyplot
+        for kind, diagonal in (('ST', ''), ('S2', ''), ('STS2', 'ST'), ('all', '')):
+            file = os.path.join(tmp, f'{kind}.png')
+            fig, ax = s.plot_sobol_results(dct, metric=metric, kind=kind,
+                                           plot_in_diagonal=diagonal,
+                                           file=file, close_fig=True)
+            assert os.path.getsize(file) > 0
+            assert not plt.get_fignums()
+            assert fig.canvas.manager is None
+
+    # Otherwise pyplot figures are returned
+    fig, ax = s.plot_sobol_results(dct, metric=metric, kind='all', close_fig=False)
+    assert plt.get_fignums() == [fig.number]
+    plt.close('all')
+
+
+def test_morris_till_convergence():
+    import numpy as np, pandas as pd
+    from numpy.testing import assert_allclose
+    from SALib.analyze import morris
+    from qsdsan import stats as s
+    from qsdsan.utils import load_example_model
+
+    # Reference of adding one trajectory at a time and analyzing
+    # all the cumulative trajectories, seeding the sampling also resets
+    # the random state for the bootstrapped confidence intervals
+    N_max = 5
+    model = load_example_model(evaluate=False)
+    inputs = s.define_inputs(model)
+    samples = s.generate_samples(inputs, kind='Morris', N=N_max, seed=554)
+    traj_len = len(model.parameters) + 1
+    cum_model = model.copy()
+    cum_model.load_samples(samples[:2*traj_len])
+    cum_model.evaluate()
+    ref = {}
+    for n in range(2, N_max+1):
+        if n > 2:
+            temp_model = model.copy()
+            temp_model.load_samples(samples[(n-1)*traj_len: n*traj_len])
+            temp_model.evaluate()
+            cum_model.table = pd.concat((cum_model.table, temp_model.table))
+        Y = cum_model.table.values[:, traj_len-1:]
+        for idx, metric in enumerate(model.metrics):
+            ref[n, metric.name] = morris.analyze(
+                inputs, samples[:n*traj_len], Y[:, idx], num_levels=4)
+
+    model = load_example_model(evaluate=False)
+    dct = s.morris_till_convergence(model, inputs, seed=554, N_max=N_max)
+    for (n, name), result in ref.items():
+        for key in ('mu_star', 'mu_star_conf'):
+            assert_allclose(dct[key][name].loc[n].values.astype(float), result[key],
+                            rtol=1e-9, err_msg=f'{name} {key} {n}')
+
+
+if __name__ == '__main__':
+    test_get_correlations()
+    test_sobol_analysis()
+    test_plot_sobol_results()
+    test_morris_till_convergence()